@@ -1,10 +1,29 @@
 import os
+import sqlite3
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import Engine
 
 db = SQLAlchemy()
 
-def create_app():
+@event.listens_for(Engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets readers proceed while a writer commits, and the busy timeout
+    # makes concurrent writers wait for the lock instead of failing with
+    # "database is locked". synchronous=NORMAL is durable under WAL except
+    # for the last commits before a power loss.
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=30000")
+    cursor.execute("PRAGMA cache_size=-20000")  # 20 MB page cache
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+def create_app(test_config=None):
     # Force a specific absolute path for templates
     templates_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../templates')
     print("Explicit templates path:", templates_path)  # Debugging output
@@ -12,15 +31,60 @@ def create_app():
 
     app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///todo.db'
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    if test_config is not None:
+        app.config.update(test_config)
 
     db.init_app(app)
 
     # Import and register blueprints
     from app.routes import main
+    from app.api import api
+    from app.search import backfill_search_command
     app.register_blueprint(main)
+    app.register_blueprint(api)
+    app.cli.add_command(backfill_search_command)
 
     # Ensure database tables are created
     with app.app_context():
-        db.create_all()
+        upgrade_schema()
 
     return app
+
+def upgrade_schema():
+    """Create the tables, and bring a database created by an older version up
+    to the current models.
+
+    create_all() skips tables that already exist, so columns and indexes
+    added since then are created here, and indexes that were replaced are
+    dropped.
+    """
+    # pysqlite does not open a transaction before DDL, so take SQLite's write
+    # lock explicitly. Workers starting together then upgrade one at a time,
+    # and each checks the schema only once it holds the lock. With the driver
+    # in autocommit mode, begin() only marks the block for SQLAlchemy, and
+    # its commit or rollback ends the transaction opened here.
+    with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+        with connection.begin():
+            connection.execute(db.text("BEGIN IMMEDIATE"))
+            _upgrade_schema(connection)
+
+def _upgrade_schema(connection):
+    from app.models import Task
+    from app.search import create_search_index, backfill_search_index
+    db.metadata.create_all(bind=connection)
+    columns = {column['name'] for column in inspect(connection).get_columns('task')}
+    if 'updated_at' not in columns:
+        connection.execute(db.text("ALTER TABLE task ADD COLUMN updated_at DATETIME"))
+        connection.execute(db.text("UPDATE task SET updated_at = COALESCE(created_at, due_date)"))
+    if 'deleted_at' not in columns:
+        connection.execute(db.text("ALTER TABLE task ADD COLUMN deleted_at DATETIME"))
+    if 'version' not in columns:
+        connection.execute(db.text("ALTER TABLE task ADD COLUMN version INTEGER NOT NULL DEFAULT 0"))
+        connection.execute(db.text("UPDATE task SET version = id"))
+    # Replaced by ix_task_deleted_at_due_date and ix_task_version.
+    connection.execute(db.text("DROP INDEX IF EXISTS ix_task_due_date"))
+    connection.execute(db.text("DROP INDEX IF EXISTS ix_task_updated_at"))
+    for index in Task.__table__.indexes:
+        index.create(bind=connection, checkfirst=True)
+    if create_search_index(connection):
+        backfill_search_index(connection)
@@ -0,0 +1,167 @@
+from flask import Blueprint, request, jsonify, abort, make_response
+from sqlalchemy import bindparam
+from werkzeug.exceptions import HTTPException
+from app import search
+from app.models import Task, FILTERS, db
+from datetime import datetime, timedelta, timezone
+
+api = Blueprint('api', __name__, url_prefix='/api')
+
+MAX_BATCH = 1000
+PER_PAGE = 500
+UPDATABLE_FIELDS = ('content', 'due_date')
+
+@api.errorhandler(HTTPException)
+def handle_http_error(error):
+    return jsonify(error=error.description), error.code
+
+def _batch(key):
+    payload = request.get_json(silent=True)
+    items = payload.get(key) if isinstance(payload, dict) else None
+    if not isinstance(items, list) or not items:
+        abort(400, f"Expected a non-empty '{key}' list")
+    if len(items) > MAX_BATCH:
+        abort(400, f"At most {MAX_BATCH} items per request")
+    return items
+
+def _parse_task_fields(item):
+    if not isinstance(item, dict):
+        abort(400, "Each task must be an object")
+    fields = {}
+    if 'content' in item:
+        content = item['content']
+        if not isinstance(content, str) or not content or len(content) > 200:
+            abort(400, "'content' must be a string of 1 to 200 characters")
+        fields['content'] = content
+    try:
+        if 'due_date' in item:
+            due_date = datetime.fromisoformat(item['due_date'])
+            if due_date.tzinfo is not None:
+                # Stored naive, in UTC like utcnow(), which the filters compare against.
+                due_date = due_date.astimezone(timezone.utc).replace(tzinfo=None)
+            fields['due_date'] = due_date
+        elif 'due_in' in item:  # Due in minutes, as in the form
+            fields['due_date'] = datetime.utcnow() + timedelta(minutes=int(item['due_in']))
+    except (TypeError, ValueError, OverflowError):
+        abort(400, "Invalid 'due_date' or 'due_in'")
+    return fields
+
+def _is_id(value):
+    # JSON true/false arrive as bool, which is a subclass of int.
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def _cursor_arg(name, column='due_date'):
+    value = request.args.get(name)
+    if value is None:
+        return None
+    try:
+        return Task.parse_cursor(value, column)
+    except ValueError:
+        abort(400, f"Invalid '{name}' cursor")
+
+def _limit_arg():
+    limit = request.args.get('limit', PER_PAGE, type=int)
+    return max(1, min(limit, PER_PAGE))
+
+@api.route('/tasks', methods=['GET'])
+def list_tasks():
+    """All live tasks ordered by due date, with an ETag for conditional polling."""
+    etag = Task.etag()
+    if request.if_none_match.contains(etag):
+        response = make_response('', 304)
+    else:
+        tasks, next_cursor = Task.page_after(Task.live(), _cursor_arg('after'), _limit_arg())
+        response = jsonify(tasks=[task.to_dict() for task in tasks], next=next_cursor)
+    response.set_etag(etag)
+    return response
+
+@api.route('/sync', methods=['GET'])
+def sync_tasks():
+    """Tasks created, modified or deleted since the client's ``cursor``.
+
+    Deleted tasks come back as tombstones. Clients keep requesting with the
+    returned cursor until ``has_more`` is false.
+    """
+    tasks, next_cursor = Task.changes_after(_cursor_arg('cursor', 'version'), _limit_arg())
+    has_more = next_cursor is not None
+    if not has_more:
+        next_cursor = tasks[-1].cursor('version') if tasks else request.args.get('cursor')
+    return jsonify(changes=[task.to_dict() for task in tasks], cursor=next_cursor, has_more=has_more)
+
+@api.route('/search', methods=['GET'])
+def search_tasks():
+    """Live tasks whose content matches ``q``, best match first.
+
+    Words ending in ``*`` match as prefixes. ``filter`` narrows the results
+    to overdue or due-soon tasks as on the index page.
+    """
+    expression = search.match_expression(request.args.get('q', ''))
+    if not expression:
+        abort(400, "Expected a search query 'q'")
+    current_filter = request.args.get('filter', 'all')
+    if current_filter not in FILTERS:
+        abort(400, f"'filter' must be one of {', '.join(FILTERS)}")
+    cursor = request.args.get('after')
+    if cursor is not None:
+        try:
+            cursor = search.parse_cursor(cursor)
+        except ValueError:
+            abort(400, "Invalid 'after' cursor")
+
+    tasks, next_cursor = search.search(Task.filtered(current_filter), expression, cursor, _limit_arg())
+    return jsonify(tasks=[task.to_dict() for task in tasks], next=next_cursor)
+
+@api.route('/tasks', methods=['POST'])
+def create_tasks():
+    tasks = []
+    for item in _batch('tasks'):
+        fields = _parse_task_fields(item)
+        if 'content' not in fields:
+            abort(400, "Each task needs 'content'")
+        tasks.append(Task(**fields))
+
+    db.session.add_all(tasks)
+    db.session.flush()
+    ids = [task.id for task in tasks]
+    db.session.commit()
+    # The commit expires the new objects; reload them in one query rather
+    # than letting to_dict() refresh each row separately.
+    tasks = Task.query.filter(Task.id.in_(ids)).order_by(Task.id).all()
+    return jsonify(tasks=[task.to_dict() for task in tasks]), 201
+
+@api.route('/tasks', methods=['PATCH'])
+def update_tasks():
+    # Group the updates by the set of fields they change so that each group
+    # runs as a single executemany UPDATE.
+    groups = {}
+    for item in _batch('tasks'):
+        fields = _parse_task_fields(item)
+        if not _is_id(item.get('id')) or not fields:
+            abort(400, "Each task needs an integer 'id' and a field to update")
+        fields['task_id'] = item['id']
+        groups.setdefault(tuple(sorted(fields)), []).append(fields)
+
+    updated = 0
+    for keys, rows in groups.items():
+        stmt = (Task.__table__.update()
+                .where(Task.id == bindparam('task_id'), Task.deleted_at.is_(None))
+                .values({key: bindparam(key) for key in keys if key in UPDATABLE_FIELDS}))
+        updated += db.session.execute(stmt, rows).rowcount
+    if updated != sum(len(rows) for rows in groups.values()):
+        db.session.rollback()
+        abort(404, "One or more tasks do not exist")
+    db.session.commit()
+    return jsonify(updated=updated)
+
+@api.route('/tasks', methods=['DELETE'])
+def delete_tasks():
+    ids = _batch('ids')
+    if not all(_is_id(task_id) for task_id in ids):
+        abort(400, "'ids' must be a list of integers")
+
+    stmt = (Task.__table__.update()
+            .where(Task.id.in_(ids), Task.deleted_at.is_(None))
+            .values(deleted_at=datetime.utcnow()))
+    deleted = db.session.execute(stmt).rowcount
+    db.session.commit()
+    return jsonify(deleted=deleted)
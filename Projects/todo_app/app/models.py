@@ -1,11 +1,120 @@
 from app import db
 from datetime import datetime, timedelta
 
+# Tasks due within this window (and not yet overdue) count as "due soon".
+DUE_SOON_WINDOW = timedelta(hours=1)
+
+FILTERS = ('all', 'overdue', 'soon')
+
+# Filter counts above this are shown as "1000+".
+COUNT_CAP = 1000
+
+# The change number for a write: one more than the highest so far. It is
+# evaluated inside the writing statement, which holds SQLite's write lock, so
+# every commit gets numbers above all earlier commits and a sync cursor never
+# skips a change that committed after it was handed out. Rows written by the
+# same statement share a number; (version, id) orders them.
+NEXT_VERSION = db.literal_column("(SELECT COALESCE(MAX(version), 0) + 1 FROM task)")
+
 class Task(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     content = db.Column(db.String(200), nullable=False)
     due_date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    version = db.Column(db.Integer, nullable=False, default=NEXT_VERSION, onupdate=NEXT_VERSION, index=True)
+    # Deleted tasks are kept as tombstones so sync clients learn about them.
+    deleted_at = db.Column(db.DateTime)
+
+    # Live tasks (deleted_at IS NULL) form a prefix of this index, ordered by due date.
+    __table_args__ = (
+        db.Index('ix_task_deleted_at_due_date', 'deleted_at', 'due_date'),
+    )
+
+    @classmethod
+    def live(cls):
+        return cls.query.filter(cls.deleted_at.is_(None))
+
+    @classmethod
+    def filtered(cls, name, now=None):
+        """Return a query for the named filter; each one is a range on the due_date index."""
+        now = now or datetime.utcnow()
+        query = cls.live()
+        if name == 'overdue':
+            query = query.filter(cls.due_date < now)
+        elif name == 'soon':
+            query = query.filter(cls.due_date >= now, cls.due_date < now + DUE_SOON_WINDOW)
+        return query
+
+    @classmethod
+    def filter_counts(cls, now=None):
+        """Count the tasks in each filter, stopping at COUNT_CAP + 1.
+
+        Capping keeps each count to a bounded index range however many tasks
+        there are; callers show anything above COUNT_CAP as "COUNT_CAP+".
+        """
+        now = now or datetime.utcnow()
+        counts = {}
+        for name in FILTERS:
+            capped = (cls.filtered(name, now).with_entities(cls.id).order_by(None)
+                      .limit(COUNT_CAP + 1).subquery())
+            counts[name] = db.session.query(db.func.count()).select_from(capped).scalar()
+        return counts
+
+    @staticmethod
+    def page_after(query, cursor, per_page, column='due_date'):
+        """Keyset pagination ordered by (column, id), starting after ``cursor``.
+
+        Returns the tasks on the page and the cursor for the next one (or None).
+        """
+        key = getattr(Task, column)
+        if cursor is not None:
+            value, task_id = cursor
+            # The first clause bounds the index range scan; the second breaks ties.
+            query = query.filter(key >= value, db.or_(key > value, Task.id > task_id))
+        tasks = query.order_by(key, Task.id).limit(per_page + 1).all()
+        next_cursor = None
+        if len(tasks) > per_page:
+            tasks = tasks[:per_page]
+            next_cursor = tasks[-1].cursor(column)
+        return tasks, next_cursor
+
+    @classmethod
+    def changes_after(cls, cursor, limit):
+        """Tasks created, modified or deleted after ``cursor``, oldest change first."""
+        return cls.page_after(cls.query, cursor, limit, column='version')
+
+    @classmethod
+    def etag(cls):
+        """A version tag for the whole task list, read from the version index.
+
+        Every insert, update and delete moves the task to a new, higher
+        version, so the tag changes whenever the list does.
+        """
+        return str(db.session.query(db.func.max(cls.version)).scalar() or 0)
+
+    def cursor(self, column='due_date'):
+        value = getattr(self, column)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        return f"{value}_{self.id}"
+
+    @staticmethod
+    def parse_cursor(value, column='due_date'):
+        key, _, task_id = value.rpartition('_')
+        key = int(key) if column == 'version' else datetime.fromisoformat(key)
+        return key, int(task_id)
+
+    def to_dict(self):
+        if self.deleted_at is not None:
+            return {'id': self.id, 'deleted': True, 'updated_at': self.updated_at.isoformat()}
+        return {
+            'id': self.id,
+            'content': self.content,
+            'due_date': self.due_date.isoformat(),
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat(),
+        }
 
     def time_remaining(self):
         return self.due_date - datetime.utcnow()
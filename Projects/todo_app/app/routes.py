@@ -1,19 +1,37 @@
-from flask import Blueprint, render_template, request, redirect, url_for
-from app.models import Task, db
+from flask import Blueprint, render_template, request, redirect, url_for, abort
+from app.models import Task, FILTERS, COUNT_CAP, db
 from datetime import datetime, timedelta
 
 main = Blueprint('main', __name__)
 
+PER_PAGE = 50
+
 @main.route('/')
 def index():
-    tasks = Task.query.all()
-    return render_template('index.html', tasks=tasks)
+    current_filter = request.args.get('filter', 'all')
+    if current_filter not in FILTERS:
+        abort(400)
+    cursor = request.args.get('after')
+    if cursor is not None:
+        try:
+            cursor = Task.parse_cursor(cursor)
+        except ValueError:
+            abort(400)
+
+    now = datetime.utcnow()
+    tasks, next_cursor = Task.page_after(Task.filtered(current_filter, now), cursor, PER_PAGE)
+    return render_template('index.html', tasks=tasks, next_cursor=next_cursor,
+                           current_filter=current_filter, counts=Task.filter_counts(now),
+                           count_cap=COUNT_CAP)
 
 @main.route('/add', methods=['POST'])
 def add_task():
     task_content = request.form['content']
-    due_in = int(request.form['due_in'])  # Due in minutes
-    due_date = datetime.utcnow() + timedelta(minutes=due_in)
+    try:
+        due_in = int(request.form['due_in'])  # Due in minutes
+        due_date = datetime.utcnow() + timedelta(minutes=due_in)
+    except (ValueError, OverflowError):
+        abort(400)
     new_task = Task(content=task_content, due_date=due_date)
 
     db.session.add(new_task)
@@ -22,7 +40,9 @@ def add_task():
 
 @main.route('/delete/<int:id>')
 def delete_task(id):
-    task = Task.query.get_or_404(id)
-    db.session.delete(task)
+    deleted = Task.live().filter_by(id=id).update({'deleted_at': datetime.utcnow()},
+                                                  synchronize_session=False)
+    if not deleted:
+        abort(404)
     db.session.commit()
     return redirect(url_for('main.index'))
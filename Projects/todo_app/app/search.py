@@ -0,0 +1,95 @@
+import re
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import literal_column, table
+from app import db
+from app.models import Task
+
+# task_fts indexes the content of live tasks. It is an external-content table,
+# so the text is stored once (in task) and the triggers below keep the index
+# in step with inserts, edits, deletes and tombstoning.
+SCHEMA = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS task_fts
+       USING fts5(content, content='task', content_rowid='id', prefix='2 3')""",
+    """CREATE TRIGGER IF NOT EXISTS task_fts_insert AFTER INSERT ON task
+       WHEN new.deleted_at IS NULL BEGIN
+           INSERT INTO task_fts(rowid, content) VALUES (new.id, new.content);
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS task_fts_delete AFTER DELETE ON task
+       WHEN old.deleted_at IS NULL BEGIN
+           INSERT INTO task_fts(task_fts, rowid, content) VALUES ('delete', old.id, old.content);
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS task_fts_update AFTER UPDATE OF content, deleted_at ON task BEGIN
+           INSERT INTO task_fts(task_fts, rowid, content)
+               SELECT 'delete', old.id, old.content WHERE old.deleted_at IS NULL;
+           INSERT INTO task_fts(rowid, content)
+               SELECT new.id, new.content WHERE new.deleted_at IS NULL;
+       END""",
+]
+
+TOKEN = re.compile(r'\w+\*?')
+
+match = literal_column('task_fts').op('MATCH')
+rank = literal_column('task_fts.rank')
+fts_rowid = literal_column('task_fts.rowid')
+
+def create_search_index(connection):
+    """Create the FTS table and triggers; returns True if the table is new."""
+    exists = connection.execute(db.text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'task_fts'")).first()
+    for statement in SCHEMA:
+        connection.execute(db.text(statement))
+    return exists is None
+
+def backfill_search_index(connection):
+    """Rebuild the index from the live tasks; returns the number indexed."""
+    connection.execute(db.text("INSERT INTO task_fts(task_fts) VALUES ('delete-all')"))
+    return connection.execute(db.text(
+        "INSERT INTO task_fts(rowid, content) "
+        "SELECT id, content FROM task WHERE deleted_at IS NULL")).rowcount
+
+def match_expression(text):
+    """Turn user input into an FTS5 query that matches all of its words.
+
+    Each word is quoted so FTS5 operators in the input are taken literally;
+    a trailing ``*`` makes that word a prefix query.
+    """
+    terms = []
+    for token in TOKEN.findall(text):
+        word = token.rstrip('*')
+        terms.append(f'"{word}"*' if token.endswith('*') else f'"{word}"')
+    return ' '.join(terms)
+
+def matching(query, expression):
+    """Restrict a Task query to rows matching an FTS5 expression."""
+    return query.join(table('task_fts'), fts_rowid == Task.id).filter(match(expression))
+
+def search(query, expression, cursor, per_page):
+    """Keyset pagination over ``query`` restricted to matches, best match first.
+
+    Returns the tasks on the page and the cursor for the next one (or None).
+    """
+    query = matching(query, expression)
+    if cursor is not None:
+        last_rank, task_id = cursor
+        query = query.filter(db.or_(rank > last_rank, db.and_(rank == last_rank, Task.id > task_id)))
+    rows = query.add_columns(rank).order_by(rank, Task.id).limit(per_page + 1).all()
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        task, task_rank = rows[-1]
+        next_cursor = f"{task_rank!r}_{task.id}"
+    return [task for task, _ in rows], next_cursor
+
+def parse_cursor(value):
+    last_rank, _, task_id = value.rpartition('_')
+    return float(last_rank), int(task_id)
+
+@click.command('backfill-search')
+@with_appcontext
+def backfill_search_command():
+    """Index existing tasks for full-text search."""
+    with db.engine.begin() as connection:
+        create_search_index(connection)
+        count = backfill_search_index(connection)
+    click.echo(f"Indexed {count} tasks.")
@@ -0,0 +1,75 @@
+"""Concurrent write load test for the JSON API.
+
+Starts several threads that create, update and delete tasks in batches against
+a scratch database at the same time, then reports throughput and any failed
+requests (such as "database is locked" errors).
+
+    python loadtest.py --threads 8 --seconds 10
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from app import create_app
+
+
+def worker(app, deadline, batch_size, stats, lock):
+    client = app.test_client()
+    done = requests = 0
+    errors = []
+    while time.monotonic() < deadline:
+        response = client.post('/api/tasks', json={
+            'tasks': [{'content': f'load task {i}', 'due_in': i} for i in range(batch_size)]})
+        responses = [response]
+        if response.status_code == 201:
+            ids = [task['id'] for task in response.get_json()['tasks']]
+            responses.append(client.patch('/api/tasks', json={
+                'tasks': [{'id': task_id, 'content': 'updated'} for task_id in ids]}))
+            responses.append(client.delete('/api/tasks', json={'ids': ids[::2]}))
+        for response in responses:
+            requests += 1
+            if response.status_code >= 400:
+                errors.append(response.get_data(as_text=True)[:200])
+            else:
+                done += batch_size
+    with lock:
+        stats['rows'] += done
+        stats['requests'] += requests
+        stats['errors'].extend(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--batch-size', type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(tmp, 'load.db')})
+        stats = {'rows': 0, 'requests': 0, 'errors': []}
+        lock = threading.Lock()
+        deadline = time.monotonic() + args.seconds
+        threads = [threading.Thread(target=worker, args=(app, deadline, args.batch_size, stats, lock))
+                   for _ in range(args.threads)]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - start
+
+    locked = sum('database is locked' in error for error in stats['errors'])
+    print(f"{args.threads} threads, {elapsed:.1f}s")
+    print(f"requests: {stats['requests']} ({stats['requests'] / elapsed:.0f}/s)")
+    print(f"rows written: {stats['rows']} ({stats['rows'] / elapsed:.0f}/s)")
+    print(f"failed requests: {len(stats['errors'])} ({locked} 'database is locked')")
+    for error in stats['errors'][:5]:
+        print("  ", error)
+    return 1 if stats['errors'] else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
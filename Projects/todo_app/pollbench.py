@@ -0,0 +1,127 @@
+"""Polling cost benchmark for the task list and sync APIs.
+
+Seeds a scratch database, then has many simulated clients poll it while a
+writer changes one task now and then. Each client polls in one of three ways:
+fetching every page of the full list, fetching it with If-None-Match (and
+every page when it has changed), or asking /api/sync for changes since its
+cursor.
+
+    python pollbench.py --tasks 10000 --clients 50 --seconds 5
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+from app import create_app, db
+from app.models import Task
+
+MODES = ('full', 'etag', 'sync')
+
+
+def fetch_rest(client, response):
+    """Follow the list's ``next`` cursors so the whole list is loaded."""
+    next_cursor = response.get_json()['next']
+    while next_cursor:
+        next_cursor = client.get('/api/tasks', query_string={'after': next_cursor}).get_json()['next']
+
+
+def poll(client, mode, state):
+    if mode == 'full':
+        response = client.get('/api/tasks')
+        fetch_rest(client, response)
+        return response
+    if mode == 'etag':
+        response = client.get('/api/tasks', headers={'If-None-Match': state.get('etag', '')})
+        state['etag'] = response.headers.get('ETag', '')
+        if response.status_code == 200:
+            fetch_rest(client, response)
+        return response
+    path = '/api/sync' + (f"?cursor={state['cursor']}" if 'cursor' in state else '')
+    response = client.get(path)
+    state['cursor'] = response.get_json()['cursor']
+    return response
+
+
+def client_loop(app, mode, ready, seconds, results, lock):
+    client = app.test_client()
+    state = {}
+    # Initial full load, not measured
+    while mode == 'sync' and poll(client, mode, state).get_json()['has_more']:
+        pass
+    poll(client, mode, state)
+    ready.wait()
+    started = time.monotonic()
+    deadline = started + seconds
+    latencies = []
+    cheap = 0
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        response = poll(client, mode, state)
+        latencies.append(time.perf_counter() - start)
+        if response.status_code == 304 or (mode == 'sync' and not response.get_json()['changes']):
+            cheap += 1
+    # A slow poll can run past the deadline, so rates use the time taken.
+    elapsed = time.monotonic() - started
+    with lock:
+        results['latencies'].extend(latencies)
+        results['cheap'] += cheap
+        results['elapsed'] = max(results['elapsed'], elapsed)
+
+
+def writer_loop(app, ready, seconds, interval):
+    client = app.test_client()
+    ready.wait()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        client.patch('/api/tasks', json={'tasks': [{'id': 1, 'content': f'edited {time.time()}'}]})
+        time.sleep(interval)
+
+
+def run(app, mode, clients, seconds, write_interval):
+    results = {'latencies': [], 'cheap': 0, 'elapsed': 0}
+    lock = threading.Lock()
+    # Measurement starts once every client has finished its initial load.
+    ready = threading.Barrier(clients + 1)
+    threads = [threading.Thread(target=client_loop, args=(app, mode, ready, seconds, results, lock))
+               for _ in range(clients)]
+    threads.append(threading.Thread(target=writer_loop, args=(app, ready, seconds, write_interval)))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencies = sorted(results['latencies'])
+    count = len(latencies)
+    print(f"{mode:>5}: {count / results['elapsed']:7.1f} polls/s  "
+          f"mean {sum(latencies) / count * 1000:7.2f} ms  "
+          f"p95 {latencies[int(count * 0.95)] * 1000:7.2f} ms  "
+          f"unchanged {results['cheap'] / count:5.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=10000)
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--write-interval', type=float, default=0.5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(tmp, 'poll.db')})
+        with app.app_context():
+            now = datetime.utcnow()
+            db.session.execute(Task.__table__.insert(), [
+                {'content': f'task {i}', 'due_date': now + timedelta(minutes=i)}
+                for i in range(args.tasks)])
+            db.session.commit()
+
+        print(f"{args.tasks} tasks, {args.clients} clients, one write every {args.write_interval}s")
+        for mode in MODES:
+            run(app, mode, args.clients, args.seconds, args.write_interval)
+
+
+if __name__ == '__main__':
+    main()
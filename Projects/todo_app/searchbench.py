@@ -0,0 +1,76 @@
+"""Full-text search benchmark: FTS5 against a LIKE '%term%' scan.
+
+Seeds a scratch database with synthetic tasks (through the triggers, so the
+index is built the same way as in production), then times both approaches
+for a few queries.
+
+    python searchbench.py --tasks 1000000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from app import create_app, db, search
+from app.models import Task
+
+WORDS = ('buy call email fix review plan write read clean book pay send '
+         'order update check meet prepare schedule deploy test').split()
+QUERIES = ('invoice', 'deploy', 'report4*', 'deploy review')
+
+
+def seed(count, batch_size=10000):
+    rng = random.Random(0)
+    now = datetime.utcnow()
+    for start in range(0, count, batch_size):
+        db.session.execute(Task.__table__.insert(), [
+            {'content': ' '.join(rng.choice(WORDS) for _ in range(3)) + f' report{i % 50000}'
+                        + (' invoice' if i % 1000 == 0 else ''),
+             'due_date': now + timedelta(minutes=rng.randint(-10000, 10000))}
+            for i in range(start, min(start + batch_size, count))])
+        db.session.commit()
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--limit', type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(tmp, 'search.db')})
+        with app.app_context():
+            start = time.perf_counter()
+            seed(args.tasks)
+            print(f"seeded {args.tasks} tasks in {time.perf_counter() - start:.1f}s")
+
+            print(f"{'query':>14} {'matches':>8} | first {args.limit} ms: {'fts':>7} {'like':>7} "
+                  f"| count ms: {'fts':>7} {'like':>7}")
+            for text in QUERIES:
+                expression = search.match_expression(text)
+                fts = search.matching(Task.live(), expression)
+                like = Task.live()
+                for word in text.split():
+                    like = like.filter(Task.content.like(f"%{word.rstrip('*')}%"))
+                # FTS pages are ranked, so every match is scored; LIKE pages
+                # are unranked and stop at the first matches it comes across.
+                fts_page, _ = timed(lambda: search.search(Task.live(), expression, None, args.limit),
+                                    args.repeat)
+                like_page, _ = timed(lambda: like.limit(args.limit).all(), args.repeat)
+                fts_count, matches = timed(fts.count, args.repeat)
+                like_count, _ = timed(like.count, args.repeat)
+                print(f"{text:>14} {matches:8} | {'':>15}{fts_page:7.2f} {like_page:7.2f} "
+                      f"| {'':>9}{fts_count:7.2f} {like_count:7.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,15 @@
+import pytest
+from app import create_app
+
+
+@pytest.fixture
+def app(tmp_path):
+    return create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + str(tmp_path / 'todo.db'),
+    })
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
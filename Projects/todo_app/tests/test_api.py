@@ -0,0 +1,86 @@
+import pytest
+
+from app.models import Task
+
+
+def create(client, *contents):
+    response = client.post('/api/tasks', json={'tasks': [{'content': c, 'due_in': 10} for c in contents]})
+    assert response.status_code == 201
+    return [task['id'] for task in response.get_json()['tasks']]
+
+
+def contents(app):
+    with app.app_context():
+        return {task.id: task.content for task in Task.live()}
+
+
+def test_batch_create_update_delete(app, client):
+    first, second, third = create(client, 'a', 'b', 'c')
+
+    response = client.patch('/api/tasks', json={'tasks': [
+        {'id': first, 'content': 'a2'}, {'id': second, 'due_in': 5}]})
+    assert response.get_json() == {'updated': 2}
+    response = client.delete('/api/tasks', json={'ids': [third, 999]})
+    assert response.get_json() == {'deleted': 1}
+
+    assert contents(app) == {first: 'a2', second: 'b'}
+
+
+def test_patch_with_a_missing_id_rolls_back_the_whole_batch(app, client):
+    first, second = create(client, 'a', 'b')
+
+    response = client.patch('/api/tasks', json={'tasks': [
+        {'id': first, 'content': 'changed'},
+        {'id': second, 'due_in': 60},
+        {'id': 999, 'content': 'missing'}]})
+
+    assert response.status_code == 404
+    assert 'error' in response.get_json()
+    assert contents(app) == {first: 'a', second: 'b'}
+
+
+def test_patch_of_a_deleted_task_is_not_found(app, client):
+    task_id, = create(client, 'a')
+    client.delete('/api/tasks', json={'ids': [task_id]})
+
+    response = client.patch('/api/tasks', json={'tasks': [{'id': task_id, 'content': 'b'}]})
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize('method, payload', [
+    ('post', {'tasks': []}),
+    ('post', {}),
+    ('post', {'tasks': [{'due_in': 5}]}),
+    ('post', {'tasks': [{'content': ''}]}),
+    ('post', {'tasks': [{'content': 'x' * 201}]}),
+    ('post', {'tasks': [{'content': 7}]}),
+    ('post', {'tasks': ['a']}),
+    ('post', {'tasks': [{'content': 'a', 'due_in': 10 ** 10}]}),
+    ('post', {'tasks': [{'content': 'a', 'due_date': 'tomorrow'}]}),
+    ('patch', {'tasks': []}),
+    ('patch', {'tasks': [{'content': 'no id'}]}),
+    ('patch', {'tasks': [{'id': True, 'content': 'bool id'}]}),
+    ('patch', {'tasks': [{'id': 1}]}),
+    ('delete', {'ids': []}),
+    ('delete', {'ids': ['1']}),
+    ('delete', {'ids': [True]}),
+])
+def test_invalid_batches_are_rejected(app, client, method, payload):
+    create(client, 'a')
+
+    response = getattr(client, method)('/api/tasks', json=payload)
+
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+    assert contents(app) == {1: 'a'}
+
+
+def test_due_date_with_offset_is_stored_as_utc(client):
+    response = client.post('/api/tasks', json={'tasks': [
+        {'content': 'a', 'due_date': '2030-01-01T00:00:00+05:00'}]})
+    assert response.get_json()['tasks'][0]['due_date'] == '2029-12-31T19:00:00'
+
+
+def test_form_rejects_out_of_range_due_in(client):
+    assert client.post('/add', data={'content': 'a', 'due_in': str(10 ** 10)}).status_code == 400
+    assert client.post('/add', data={'content': 'a', 'due_in': 'soon'}).status_code == 400
@@ -0,0 +1,56 @@
+import html
+import re
+from datetime import datetime, timedelta
+
+from app import db
+from app.models import Task, COUNT_CAP
+from app.routes import PER_PAGE
+
+NEXT_LINK = re.compile(r'class="next-page" href="([^"]+)"')
+TASK = re.compile(r'<li>\s*(\S+) - Due in')
+
+
+def insert(app, due_dates):
+    with app.app_context():
+        db.session.execute(Task.__table__.insert(), [
+            {'content': f'task{i}', 'due_date': due_date} for i, due_date in enumerate(due_dates)])
+        db.session.commit()
+
+
+def test_paging_visits_every_task_once_in_due_date_order(app, client):
+    start = datetime.utcnow() + timedelta(days=1)
+    # Groups of three tasks share a due date, so page breaks fall inside
+    # groups and the id tie-break decides where the next page starts.
+    due_dates = [start + timedelta(minutes=i // 3) for i in range(PER_PAGE * 2 + 7)]
+    insert(app, due_dates)
+
+    seen = []
+    path = '/'
+    pages = 0
+    while path:
+        page = client.get(path).get_data(as_text=True)
+        seen.extend(TASK.findall(page))
+        link = NEXT_LINK.search(page)
+        path = html.unescape(link.group(1)) if link else None
+        pages += 1
+
+    assert pages == 3
+    assert seen == [f'task{i}' for i in range(len(due_dates))]
+
+
+def test_bad_filter_or_cursor_is_rejected(client):
+    assert client.get('/?filter=someday').status_code == 400
+    assert client.get('/?after=yesterday').status_code == 400
+    assert client.get('/?after=2030-01-01T00:00:00_x').status_code == 400
+
+
+def test_counts_above_the_cap_are_shown_as_cap_plus(app, client):
+    now = datetime.utcnow()
+    insert(app, [now - timedelta(hours=1)] * (COUNT_CAP + 1) + [now + timedelta(minutes=5)] * 3)
+
+    with app.app_context():
+        assert Task.filter_counts(now) == {'all': COUNT_CAP + 1, 'overdue': COUNT_CAP + 1, 'soon': 3}
+    page = client.get('/').get_data(as_text=True)
+    assert f'All ({COUNT_CAP}+)' in page
+    assert f'Overdue ({COUNT_CAP}+)' in page
+    assert 'Due soon (3)' in page
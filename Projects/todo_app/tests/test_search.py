@@ -0,0 +1,80 @@
+from app import db
+
+
+def create(client, *tasks):
+    response = client.post('/api/tasks', json={'tasks': [
+        {'content': content, 'due_in': due_in} for content, due_in in tasks]})
+    return [task['id'] for task in response.get_json()['tasks']]
+
+
+def search(client, q, **params):
+    response = client.get('/api/search', query_string={'q': q, **params})
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def found(client, q, **params):
+    return [task['id'] for task in search(client, q, **params)['tasks']]
+
+
+def test_triggers_keep_the_index_in_sync(client):
+    task_id, other = create(client, ('buy milk', 10), ('call mom', 10))
+    assert found(client, 'milk') == [task_id]
+
+    client.patch('/api/tasks', json={'tasks': [{'id': task_id, 'content': 'buy bread'}]})
+    assert found(client, 'milk') == []
+    assert found(client, 'bread') == [task_id]
+
+    client.delete('/api/tasks', json={'ids': [task_id]})
+    client.get(f'/delete/{other}')
+    assert found(client, 'bread') == []
+    assert found(client, 'mom') == []
+
+
+def test_prefix_query(client):
+    milk, milkshake, _ = create(client, ('buy milk', 10), ('milkshake', 10), ('mild salsa', 10))
+    assert sorted(found(client, 'milk*')) == [milk, milkshake]
+    assert found(client, 'milk') == [milk]
+
+
+def test_due_date_filters_narrow_results(client):
+    overdue, soon, later = create(client, ('report overdue', -5), ('report soon', 10),
+                                  ('report later', 600))
+    assert sorted(found(client, 'report')) == [overdue, soon, later]
+    assert found(client, 'report', filter='overdue') == [overdue]
+    assert found(client, 'report', filter='soon') == [soon]
+    assert client.get('/api/search?q=report&filter=someday').status_code == 400
+
+
+def test_paging_has_no_duplicates_or_gaps(client):
+    # Repeated content gives equal ranks, so the id tie-break is exercised.
+    contents = [('plan ' + 'plan ' * (i % 4) + f'item{i}', 10) for i in range(23)]
+    create(client, *contents)
+    everything = found(client, 'plan')
+    assert len(everything) == 23
+
+    pages = []
+    cursor = None
+    while True:
+        params = {'limit': 4, **({'after': cursor} if cursor else {})}
+        body = search(client, 'plan', **params)
+        pages.extend(task['id'] for task in body['tasks'])
+        cursor = body['next']
+        if not cursor:
+            break
+    assert pages == everything
+
+
+def test_backfill_rebuilds_the_index(app, client):
+    kept, deleted = create(client, ('water plants', 10), ('water lawn', 10))
+    client.delete('/api/tasks', json={'ids': [deleted]})
+    with app.app_context():
+        db.session.execute(db.text("INSERT INTO task_fts(task_fts) VALUES ('delete-all')"))
+        db.session.commit()
+    assert found(client, 'water') == []
+
+    result = app.test_cli_runner().invoke(args=['backfill-search'])
+
+    assert result.exit_code == 0
+    assert 'Indexed 1 tasks.' in result.output
+    assert found(client, 'water') == [kept]
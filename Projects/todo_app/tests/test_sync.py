@@ -0,0 +1,66 @@
+from app import db
+from app.models import Task
+
+
+def create(client, *contents):
+    response = client.post('/api/tasks', json={'tasks': [{'content': c, 'due_in': 10} for c in contents]})
+    return [task['id'] for task in response.get_json()['tasks']]
+
+
+def sync_all(client, cursor=None, limit=None):
+    changes = []
+    while True:
+        params = {'cursor': cursor, 'limit': limit}
+        body = client.get('/api/sync', query_string={k: v for k, v in params.items() if v}).get_json()
+        changes.extend(body['changes'])
+        cursor = body['cursor']
+        if not body['has_more']:
+            return changes, cursor
+
+
+def test_commits_in_the_same_millisecond_are_not_skipped(app, client):
+    first, second = create(client, 'first', 'second')
+    _, cursor = sync_all(client)
+
+    # Back-to-back commits on one connection usually land in the same
+    # millisecond, so repeat the scenario: a client that paged past the
+    # edit to `second` must still see the later edit to `first`, which has
+    # a lower id.
+    with app.app_context(), db.engine.connect() as connection:
+        for i in range(50):
+            for task_id in (second, first):
+                with connection.begin():
+                    connection.execute(Task.__table__.update()
+                                       .where(Task.id == task_id).values(content=f'edit {i}'))
+                if task_id == second:
+                    etag = Task.etag()
+            assert Task.etag() != etag
+
+            changes, cursor = sync_all(client, cursor, limit=1)
+            assert [task['id'] for task in changes] == [second, first]
+
+
+def test_every_commit_gets_a_higher_version(app, client):
+    ids = create(client, 'a', 'b', 'c')
+    seen = []
+    for task_id in ids * 3:
+        client.patch('/api/tasks', json={'tasks': [{'id': task_id, 'content': f'edit {len(seen)}'}]})
+        with app.app_context():
+            seen.append(db.session.get(Task, task_id).version)
+    assert seen == sorted(set(seen))
+
+
+def test_sync_pages_through_rows_from_one_statement(client):
+    ids = create(client, *[f'task {i}' for i in range(5)])
+    _, cursor = sync_all(client)
+    client.delete('/api/tasks', json={'ids': ids})
+
+    changes, _ = sync_all(client, cursor, limit=2)
+    assert [task['id'] for task in changes] == ids
+    assert all(task['deleted'] for task in changes)
+
+
+def test_unchanged_list_returns_304(client):
+    create(client, 'a')
+    etag = client.get('/api/tasks').headers['ETag']
+    assert client.get('/api/tasks', headers={'If-None-Match': etag}).status_code == 304
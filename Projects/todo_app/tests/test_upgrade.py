@@ -0,0 +1,59 @@
+import sqlite3
+import threading
+
+from app import create_app, db
+
+# The task table as created before sync and search were added.
+OLD_SCHEMA = """
+CREATE TABLE task (
+    id INTEGER NOT NULL,
+    content VARCHAR(200) NOT NULL,
+    due_date DATETIME NOT NULL,
+    created_at DATETIME,
+    PRIMARY KEY (id)
+);
+CREATE INDEX ix_task_due_date ON task (due_date);
+CREATE INDEX ix_task_created_at ON task (created_at);
+INSERT INTO task VALUES (1, 'old task', '2030-01-01 00:00:00.000000', '2029-12-31 00:00:00.000000');
+"""
+
+
+def old_database(tmp_path):
+    path = tmp_path / 'old.db'
+    connection = sqlite3.connect(path)
+    connection.executescript(OLD_SCHEMA)
+    connection.close()
+    return {'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}'}
+
+
+def test_upgrade_adds_columns_and_replaces_indexes(tmp_path):
+    app = create_app(old_database(tmp_path))
+
+    with app.app_context():
+        indexes = {row[0] for row in db.session.execute(
+            db.text("SELECT name FROM sqlite_master WHERE type = 'index'"))}
+    assert 'ix_task_due_date' not in indexes
+    assert {'ix_task_deleted_at_due_date', 'ix_task_version'} <= indexes
+    body = app.test_client().get('/api/sync').get_json()
+    assert [task['content'] for task in body['changes']] == ['old task']
+    assert app.test_client().get('/api/search?q=old').get_json()['tasks'][0]['id'] == 1
+
+
+def test_workers_starting_together_upgrade_once(tmp_path):
+    config = old_database(tmp_path)
+    start = threading.Barrier(8)
+    errors = []
+
+    def worker():
+        start.wait()
+        try:
+            create_app(config)
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []